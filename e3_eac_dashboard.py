@@ -14,10 +14,24 @@
 # - Revenue displayed as USD bn (billions)
 # - No certificate-tech tab/filter
 # - Dash 2.x / 3.x compatible run
+# - Columnar datasets: categorical labels, compact dtypes, slice indexes per region/scheme
+# - Tabs switch client-side: all panels mounted, visible one first, rest prefetched
+# - Region dropdown / map click resolved in one callback: one panel render per action
+# - Forward curves by vintage × delivery month (lazy per scheme/scenario) feed Prices + Revenue
+# - DATA graph: fingerprinted datasets/derivations, incremental recompute, panel cache, /_data-graph timings
+# - gunicorn entrypoint: e3_eac_dashboard:server (load test: e3_loadtest.py)
+
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
 
 import pandas as pd
 import numpy as np
-from dash import Dash, dcc, html, Input, Output, no_update
+from flask import jsonify
+from dash import Dash, dcc, html, Input, Output, State, ctx, no_update
 import plotly.express as px
 
 # ---------------------------
@@ -64,6 +78,8 @@ UK = set(REGION_COUNTRIES["United Kingdom"])
 EU = set(REGION_COUNTRIES["European Union"])
 US = set(REGION_COUNTRIES["United States"])
 
+# REGION_COUNTRIES is fixed at import: the static map panel and select_region
+# both read these constants, so it is deliberately not a DATA source
 COUNTRY_REGION = {}
 for c in MENA: COUNTRY_REGION[c] = "Middle East / MENA"
 for c in UK:   COUNTRY_REGION[c] = "United Kingdom"
@@ -134,18 +150,15 @@ SUPPLY_GROWTH_MULTIPLIER = {
 }
 
 def region_twh_series(region, scenario_name="Base", kind="Demand"):
-    mult = SCENARIOS[scenario_name]["demand_mult"]
-    rows = []
-    for y in demand_index_df["Year"]:
-        idx = float(demand_index_df.set_index("Year").loc[y, region])
-        if kind == "Demand":
-            base = BASE_DEMAND_TWH_2021[region]
-            val = base * idx * mult
-        else:
-            base = BASE_SUPPLY_TWH_2021[region]
-            val = base * (1 + (idx-1)*SUPPLY_GROWTH_MULTIPLIER[region]) * mult
-        rows.append((y, val))
-    return pd.DataFrame(rows, columns=["Year", f"{kind}TWh"])
+    mult = DATA.get("SCENARIOS")[scenario_name]["demand_mult"]
+    idx = DATA.get("demand_index_df:by_year")[region]
+    if kind == "Demand":
+        base = DATA.get("BASE_DEMAND_TWH_2021")[region]
+        val = base * idx * mult
+    else:
+        base = DATA.get("BASE_SUPPLY_TWH_2021")[region]
+        val = base * (1 + (idx-1)*DATA.get("SUPPLY_GROWTH_MULTIPLIER")[region]) * mult
+    return pd.DataFrame({"Year": idx.index.to_numpy(), f"{kind}TWh": val.to_numpy()})
 
 COUNTRY_SHARES = {
     "Middle East / MENA": {
@@ -161,10 +174,10 @@ COUNTRY_SHARES = {
 }
 
 def country_demand_twh(region, year, scenario_name="Base"):
-    mult = SCENARIOS[scenario_name]["demand_mult"]
-    idx = float(demand_index_df.set_index("Year").loc[year, region])
-    total = BASE_DEMAND_TWH_2021[region] * idx * mult
-    shares = COUNTRY_SHARES.get(region, {})
+    mult = DATA.get("SCENARIOS")[scenario_name]["demand_mult"]
+    idx = float(DATA.get("demand_index_df:by_year").loc[year, region])
+    total = DATA.get("BASE_DEMAND_TWH_2021")[region] * idx * mult
+    shares = DATA.get("COUNTRY_SHARES").get(region, {})
     return pd.DataFrame(
         [(c, year, total*s) for c, s in shares.items()],
         columns=["Country","Year","DemandTWh"]
@@ -275,6 +288,48 @@ policy_df = pd.DataFrame([
     ("United States","Corporate forward offtake supports multi-year contracts."),
 ], columns=["Region","PolicySummary"])
 
+# ---------------------------
+# COLUMNAR STORAGE
+# Categorical codes for labels, compact numeric dtypes, rows grouped by the
+# filter key so a region/scheme filter is a precomputed slice (no .query)
+# ---------------------------
+CATEGORY_COLS = ["Region","Scheme","Segment","Tech","Country"]
+COMPACT_DTYPES = {"Year":"int16", "AnnualMWh":"int32", "AnnualGenerationTWh":"float32"}
+
+def compact_df(df, key):
+    df = df.copy()
+    for c in df.columns:
+        if c in CATEGORY_COLS:
+            # categories in first-appearance order keep chart/legend order unchanged
+            df[c] = pd.Categorical(df[c], categories=pd.unique(df[c]))
+        elif c in COMPACT_DTYPES:
+            df[c] = df[c].astype(COMPACT_DTYPES[c])
+    order = np.argsort(df[key].cat.codes.to_numpy(), kind="stable")
+    return df.iloc[order].reset_index(drop=True)
+
+def group_slices(col):
+    values = col.to_numpy()
+    if len(values) == 0:
+        return {}
+    starts = np.r_[0, np.flatnonzero(values[1:] != values[:-1]) + 1]
+    stops = np.r_[starts[1:], len(values)]
+    return {values[a]: slice(int(a), int(b)) for a, b in zip(starts, stops)}
+
+def year_masks(col):
+    years = col.to_numpy()
+    return {int(y): years == y for y in np.unique(years)}
+
+def slice_rows(df, index, key):
+    return df.iloc[index.get(key, slice(0, 0))]
+
+# compacted once, in place of the raw frames; DATA holds these same objects,
+# so replace them with DATA.set(name, compact_df(df, key))
+buyers_df  = compact_df(buyers_df, "Region")
+gens_df    = compact_df(gens_df, "Region")
+policy_df  = compact_df(policy_df, "Region")
+prices_df  = compact_df(prices_df, "Scheme")
+anchors_df = compact_df(anchors_df, "Scheme")
+
 # ---------------------------
 # REVENUE FORECAST (scenario-dependent)
 # ---------------------------
@@ -282,8 +337,8 @@ forecast_years = list(range(2025, 2031))
 FORECAST_CAGR = {"I-RECs (incl. UAE)":0.20, "REGOs":0.08, "GOs":0.10, "RECs":0.12}
 BASE_DEMAND_2025_TWH = {"I-RECs (incl. UAE)":25, "REGOs":55, "GOs":850, "RECs":1200}
 
-def price_forecast_base(scheme):
-    hist = prices_df[prices_df["Scheme"] == scheme].sort_values("Year")
+def price_forecast_base(hist):
+    hist = hist.sort_values("Year")
     if hist["Year"].nunique() < 2:
         p2025 = float(hist[hist["Year"] == 2025]["Price"].iloc[0])
         return {y: p2025 for y in forecast_years}
@@ -296,29 +351,281 @@ def price_forecast_base(scheme):
     p2025 = float(hist[hist["Year"] == 2025]["Price"].iloc[0])
     return {y: p2025 * ((1 + price_cagr) ** (y - 2025)) for y in forecast_years}
 
-PRICE_FWD_BASE = {s: price_forecast_base(s) for s in BASE_DEMAND_2025_TWH.keys()}
-
-def build_revenue_df(scenario_name="Base"):
-    d_mult = SCENARIOS[scenario_name]["demand_mult"]
-    p_mult = SCENARIOS[scenario_name]["price_mult"]
+# ---------------------------
+# FORWARD CURVES (vintage × delivery month, scenario-dependent)
+# Grid per scheme/scenario: rows = certificate vintage, cols = delivery month.
+# Built with array ops on first use and cached as DATA nodes per scheme. A
+# single-region view (its prefetched Prices/Revenue panels included) builds
+# only its own scheme's grid; Global views build all four.
+# ---------------------------
+# indicative vintage rules: years an older vintage stays deliverable, and the
+# discount per year of age versus the delivery-year vintage
+VINTAGE_LIFE_YEARS = {"I-RECs (incl. UAE)":5, "REGOs":2, "GOs":1, "RECs":3}
+VINTAGE_DISCOUNT   = {"I-RECs (incl. UAE)":0.10, "REGOs":0.25, "GOs":0.30, "RECs":0.15}
+
+FWD_MONTHS = np.arange(forecast_years[0]*12, (forecast_years[-1]+1)*12)  # year*12 + month-1
+FWD_MONTH_YEAR = FWD_MONTHS // 12
+FWD_MONTH_DATES = pd.to_datetime(pd.DataFrame({
+    "year": FWD_MONTH_YEAR, "month": FWD_MONTHS % 12 + 1, "day": 1
+}))
+FWD_VINTAGES = np.arange(forecast_years[0] - max(VINTAGE_LIFE_YEARS.values()), forecast_years[-1] + 1)
+
+def monthly_forward(annual_fwd):
+    # log-linear between mid-year points, rescaled so every delivery year
+    # averages exactly to its annual forward price
+    annual = np.array([annual_fwd[y] for y in forecast_years])
+    t = FWD_MONTHS / 12.0 + 1 / 24
+    raw = np.exp(np.interp(t, np.array(forecast_years) + 0.5, np.log(annual))).reshape(len(forecast_years), 12)
+    return (raw * (annual / raw.mean(axis=1))[:, None]).ravel()
+
+def forward_grid(annual_fwd, price_mult, life_years, discount):
+    age = FWD_MONTH_YEAR[None, :] - FWD_VINTAGES[:, None]
+    valid = (age >= 0) & (age <= life_years)
+    disc = (1 - discount) ** np.clip(age, 0, None)
+    price = monthly_forward(annual_fwd)[None, :] * disc * price_mult
+    grid = np.where(valid, price, np.nan)
+    grid.flags.writeable = False  # shared cache entry
+    return grid
+
+def front_vintage(grid):
+    # delivery-year vintage for every month: one cell per column
+    return grid[FWD_MONTH_YEAR - FWD_VINTAGES[0], np.arange(len(FWD_MONTHS))]
+
+def annual_mean(curve):
+    curve = curve.reshape(len(forecast_years), 12)
+    return dict(zip(forecast_years, curve.mean(axis=1, dtype=np.float64).tolist()))
+
+def forward_curve(scheme, scenario_name="Base"):
+    return DATA.get(forward_curve_node(scheme, scenario_name))
+
+def front_vintage_curve(scheme, scenario_name="Base"):
+    return front_vintage(forward_curve(scheme, scenario_name))
+
+def forward_annual(scheme, scenario_name="Base"):
+    return annual_mean(front_vintage_curve(scheme, scenario_name))
+
+def revenue_table(scheme, scenario_name, scenarios, base_demand, forecast_cagr, grid):
+    d_mult = scenarios[scenario_name]["demand_mult"]
+    base, cagr = base_demand[scheme], forecast_cagr[scheme]
+    fwd = annual_mean(front_vintage(grid))
 
     rows=[]
-    for scheme in BASE_DEMAND_2025_TWH.keys():
-        base, cagr = BASE_DEMAND_2025_TWH[scheme], FORECAST_CAGR[scheme]
-        for i, y in enumerate(forecast_years):
-            demand = base * ((1 + cagr) ** i) * d_mult
-            price  = PRICE_FWD_BASE[scheme][y] * p_mult
-            revenue_musd = demand * price
-            rows.append((scheme, y, demand, price, revenue_musd))
+    for i, y in enumerate(forecast_years):
+        demand = base * ((1 + cagr) ** i) * d_mult
+        price  = fwd[y]
+        revenue_musd = demand * price
+        rows.append((scheme, y, demand, price, revenue_musd))
     df = pd.DataFrame(rows, columns=["Scheme","Year","DemandTWh","PricePerMWh","RevenueMUSD"])
     df["RevenueBUSD"] = df["RevenueMUSD"] / 1000.0  # convert to USD bn
     return df
 
+def build_revenue_df(scenario_name="Base", scheme=None):
+    # one scheme's slice, or every scheme currently in BASE_DEMAND_2025_TWH
+    schemes = [scheme] if scheme else list(DATA.get("BASE_DEMAND_2025_TWH"))
+    return pd.concat([DATA.get(revenue_node(s, scenario_name)) for s in schemes], ignore_index=True)
+
+# ---------------------------
+# DATA GRAPH
+# Named input datasets and derivations. Every node carries a fingerprint of
+# its value; a derived node recomputes only when a dependency fingerprint
+# changed, and if the result fingerprints the same nothing downstream reruns.
+# Cached panels remember the fingerprints of the nodes they read, so editing
+# one input (DATA.set) invalidates only the panels that depend on it.
+# Per-node recompute timings: DATA.stats() or GET /_data-graph.
+# ---------------------------
+def fingerprint(value):
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    else:
+        h.update(pickle.dumps(value, protocol=4))
+    return h.hexdigest()
+
+class DataGraph:
+    def __init__(self, max_cached=256):
+        self.nodes = {}
+        self.cache = OrderedDict()
+        self.max_cached = max_cached
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def __contains__(self, name):
+        return name in self.nodes
+
+    def source(self, name, value):
+        with self._lock:
+            self.nodes[name] = {"fn": None, "deps": (), "value": value, "fp": fingerprint(value),
+                                "dep_fps": None, "runs": 0, "seconds": 0.0}
+        return name
+
+    def derive(self, name, deps, fn):
+        # idempotent, so parameterised nodes can be registered on first use
+        with self._lock:
+            if name not in self.nodes:
+                self.nodes[name] = {"fn": fn, "deps": tuple(deps), "value": None, "fp": None,
+                                    "dep_fps": None, "runs": 0, "seconds": 0.0}
+        return name
+
+    def set(self, name, value):
+        with self._lock:
+            node = self.nodes[name]
+            if node["fn"] is not None:
+                raise ValueError(f"{name} is derived; set one of its inputs instead")
+            node["value"], node["fp"] = value, fingerprint(value)
+
+    def get(self, name):
+        with self._lock:
+            node = self._refresh(name)
+            # fingerprint of the value actually returned, taken under the lock
+            reads = getattr(self._local, "reads", None)
+            if reads is not None:
+                reads.setdefault(name, node["fp"])
+            return node["value"]
+
+    def _refresh(self, name):
+        node = self.nodes[name]
+        if node["fn"] is None:
+            return node
+        dep_fps = tuple(self._refresh(d)["fp"] for d in node["deps"])
+        if dep_fps != node["dep_fps"]:
+            t0 = time.perf_counter()
+            value = node["fn"](*(self.nodes[d]["value"] for d in node["deps"]))
+            node["seconds"] = time.perf_counter() - t0
+            node["runs"] += 1
+            node["value"], node["fp"], node["dep_fps"] = value, fingerprint(value), dep_fps
+        return node
+
+    def cached(self, key, build):
+        # build() reads nodes through get(); those reads, with the fingerprints
+        # get() saw, become the entry's deps
+        with self._lock:
+            hit = self.cache.get(key)
+            if hit is not None and all(self._refresh(n)["fp"] == fp for n, fp in hit[0].items()):
+                self.cache.move_to_end(key)
+                self.cache_hits += 1
+                return hit[1]
+            self.cache_misses += 1
+
+        outer = getattr(self._local, "reads", None)
+        self._local.reads = {}
+        try:
+            value = build()
+        finally:
+            reads, self._local.reads = self._local.reads, outer
+        if outer is not None:
+            for n, fp in reads.items():
+                outer.setdefault(n, fp)
+
+        with self._lock:
+            self.cache[key] = (reads, value)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "nodes": {
+                    name: {"derived": n["fn"] is not None, "deps": list(n["deps"]), "runs": n["runs"],
+                           "last_seconds": n["seconds"], "fingerprint": n["fp"]}
+                    for name, n in self.nodes.items()
+                },
+                "cache": {"entries": len(self.cache), "hits": self.cache_hits, "misses": self.cache_misses},
+            }
+
+DATA = DataGraph()
+
+for name, value in dict(
+    prices_df=prices_df, anchors_df=anchors_df, buyers_df=buyers_df, gens_df=gens_df, policy_df=policy_df,
+    demand_index_df=demand_index_df, BASE_DEMAND_TWH_2021=BASE_DEMAND_TWH_2021,
+    BASE_SUPPLY_TWH_2021=BASE_SUPPLY_TWH_2021, SUPPLY_GROWTH_MULTIPLIER=SUPPLY_GROWTH_MULTIPLIER,
+    COUNTRY_SHARES=COUNTRY_SHARES, SCENARIOS=SCENARIOS,
+    BASE_DEMAND_2025_TWH=BASE_DEMAND_2025_TWH, FORECAST_CAGR=FORECAST_CAGR,
+    VINTAGE_LIFE_YEARS=VINTAGE_LIFE_YEARS, VINTAGE_DISCOUNT=VINTAGE_DISCOUNT,
+).items():
+    DATA.source(name, value)
+
+for name, key in [("prices_df","Scheme"), ("anchors_df","Scheme"),
+                  ("buyers_df","Region"), ("gens_df","Region"), ("policy_df","Region")]:
+    DATA.derive(f"{name}:by_{key.lower()}", [name], lambda df, key=key: group_slices(df[key]))
+DATA.derive("prices_df:by_year", ["prices_df"], lambda df: year_masks(df["Year"]))
+DATA.derive("demand_index_df:by_year", ["demand_index_df"], lambda df: df.set_index("Year"))
+
+# Parameterised nodes below are registered on first use and never removed, so
+# keys are checked against the data first: a bad scheme/scenario from a request
+# raises KeyError instead of leaving a node behind.
+def check_keys(scheme, scenario_name=None):
+    if scheme not in DATA.get("BASE_DEMAND_2025_TWH"):
+        raise KeyError(f"unknown scheme: {scheme}")
+    if scenario_name is not None and scenario_name not in DATA.get("SCENARIOS"):
+        raise KeyError(f"unknown scenario: {scenario_name}")
+
+def scheme_rows_node(name, scheme):
+    # one scheme's rows; an edit to another scheme's rows leaves its fingerprint
+    # unchanged, so nothing downstream of this slice reruns
+    check_keys(scheme)
+    return DATA.derive(
+        f"{name}:{scheme}", [name, f"{name}:by_scheme"],
+        lambda df, by_scheme: slice_rows(df, by_scheme, scheme)
+    )
+
+def price_fwd_node(scheme):
+    return DATA.derive(
+        f"price_fwd:{scheme}", [scheme_rows_node("prices_df", scheme)], price_forecast_base
+    )
+
+def forward_curve_node(scheme, scenario_name):
+    check_keys(scheme, scenario_name)
+    return DATA.derive(
+        f"forward_curve:{scheme}:{scenario_name}",
+        [price_fwd_node(scheme), "SCENARIOS", "VINTAGE_LIFE_YEARS", "VINTAGE_DISCOUNT"],
+        lambda fwd, scenarios, life, discount: forward_grid(
+            fwd, scenarios[scenario_name]["price_mult"], life[scheme], discount[scheme]
+        )
+    )
+
+def revenue_node(scheme, scenario_name):
+    return DATA.derive(
+        f"revenue_df:{scheme}:{scenario_name}",
+        ["SCENARIOS", "BASE_DEMAND_2025_TWH", "FORECAST_CAGR", forward_curve_node(scheme, scenario_name)],
+        lambda scenarios, base, cagr, grid: revenue_table(scheme, scenario_name, scenarios, base, cagr, grid)
+    )
+
 # ---------------------------
 # APP
 # ---------------------------
 app = Dash(__name__, suppress_callback_exceptions=True)
 app.title = APP_TITLE
+server = app.server
+
+TABS = [
+    ("tab_intro", "Intro"),
+    ("tab_map", "Map (click country)"),
+    ("tab_prices", "Prices"),
+    ("tab_ds", "Demand & Supply"),
+    ("tab_buyers", "Top Buyers"),
+    ("tab_gens", "Generators"),
+    ("tab_policy", "Policy & Trading"),
+    ("tab_rev", "Revenue Forecast"),
+]
+TAB_IDS = [t for t, _ in TABS]
+DEFAULT_TAB = "tab_intro"
+
+def panel_id(tab):
+    return f"{tab}_panel"
+
+def prefetch_id(tab):
+    return f"{tab}_prefetch"
+
+def panel_style(tab, active):
+    return {"display": "block" if tab == active else "none"}
 
 def card(children):
     return html.Div(children, style={
@@ -328,6 +635,46 @@ def card(children):
         "boxShadow": "0 4px 18px rgba(0,0,0,0.08)"
     })
 
+# MAP: the figure does not depend on the selection, so it is built once
+def map_panel():
+    all_countries = px.data.gapminder()["country"].unique().tolist()
+    map_df = pd.DataFrame({"Country": all_countries})
+
+    def assign_region(c):
+        if c in COUNTRY_REGION:
+            return COUNTRY_REGION[c]
+        if c in MENA: return "Middle East / MENA"
+        if c in UK:   return "United Kingdom"
+        if c in EU:   return "European Union"
+        if c in US:   return "United States"
+        return "Global"
+
+    map_df["Region"] = map_df["Country"].apply(assign_region)
+    map_df["Scheme"] = map_df["Region"].map(REGION_SCHEME)
+
+    color_map = {
+        "Middle East / MENA": "#3B82F6",
+        "United Kingdom": "#10B981",
+        "European Union": "#8B5CF6",
+        "United States": "#EF4444",
+        "Global": "#FBBF24"
+    }
+
+    fig = px.choropleth(
+        map_df,
+        locations="Country",
+        locationmode="country names",
+        color="Region",
+        hover_data={"Scheme": True, "Region": True, "Country": False},
+        title="Global EAC map — hover to see scheme, click to filter",
+        color_discrete_map=color_map
+    )
+    fig.update_layout(height=540, margin=dict(l=0,r=0,t=60,b=0))
+    return card([dcc.Graph(id="country_map", figure=fig, config={"displayModeBar": False})])
+
+STATIC_PANELS = {"tab_map": map_panel()}
+DYNAMIC_TABS = [t for t in TAB_IDS if t not in STATIC_PANELS]
+
 app.layout = html.Div(style={"background":BG,"minHeight":"100vh","padding":"18px"}, children=[
     html.Div(style={"display":"flex","justifyContent":"space-between","alignItems":"center"}, children=[
         html.Div([
@@ -371,30 +718,38 @@ app.layout = html.Div(style={"background":BG,"minHeight":"100vh","padding":"18px
         ]),
     ]),
 
-    dcc.Tabs(id="tabs", value="tab_intro", children=[
-        dcc.Tab(label="Intro", value="tab_intro"),
-        dcc.Tab(label="Map (click country)", value="tab_map"),
-        dcc.Tab(label="Prices", value="tab_prices"),
-        dcc.Tab(label="Demand & Supply", value="tab_ds"),
-        dcc.Tab(label="Top Buyers", value="tab_buyers"),
-        dcc.Tab(label="Generators", value="tab_gens"),
-        dcc.Tab(label="Policy & Trading", value="tab_policy"),
-        dcc.Tab(label="Revenue Forecast", value="tab_rev"),
+    dcc.Tabs(id="tabs", value=DEFAULT_TAB, children=[
+        dcc.Tab(label=label, value=tab) for tab, label in TABS
     ]),
-    html.Div(id="tab_content", style={"marginTop":"12px"})
+    # one panel per tab, all mounted; the tab bar only toggles visibility
+    html.Div(id="tab_content", style={"marginTop":"12px"}, children=[
+        html.Div(id=panel_id(tab), style=panel_style(tab, DEFAULT_TAB), children=STATIC_PANELS.get(tab))
+        for tab in TAB_IDS
+    ]),
+    # one prefetch trigger per panel, so the visible one is never re-requested
+    *[dcc.Store(id=prefetch_id(tab)) for tab in DYNAMIC_TABS]
 ])
 
 # ---------------------------
 # CALLBACKS
 # ---------------------------
+# REGION SELECTION: dropdown change or map click → region + country in one
+# round-trip, so downstream callbacks see a single, consistent selection
 @app.callback(
+    Output("region","value"),
     Output("country","options"),
     Output("country","value"),
-    Input("region","value")
+    Input("region","value"),
+    Input("country_map","clickData")
 )
-def update_countries(region):
+def select_region(region, clickData):
+    loc = None
+    if ctx.triggered_id == "country_map" and clickData and "points" in clickData:
+        loc = clickData["points"][0].get("location")
+        region = COUNTRY_REGION.get(loc, "Global")
     countries = REGION_COUNTRIES[region]
-    return [{"label":c,"value":c} for c in countries], countries[0]
+    country = loc if loc in countries else countries[0]
+    return region, [{"label":c,"value":c} for c in countries], country
 
 @app.callback(
     Output("scheme_kpi","children"),
@@ -405,38 +760,27 @@ def update_countries(region):
 )
 def update_kpis(region, scenario):
     scheme = REGION_SCHEME[region]
-    latest_year = prices_df["Year"].max()
-    d_mult = SCENARIOS[scenario]["demand_mult"]
-    p_mult = SCENARIOS[scenario]["price_mult"]
+    price = DATA.get("prices_df")["Price"].to_numpy()
+    by_year = DATA.get("prices_df:by_year")
+    latest = by_year[max(by_year)]
+    d = DATA.get("demand_index_df:by_year")
+    d_mult = DATA.get("SCENARIOS")[scenario]["demand_mult"]
+    p_mult = DATA.get("SCENARIOS")[scenario]["price_mult"]
 
     if region == "Global":
-        latest_price = prices_df.query("Year==@latest_year")["Price"].mean() * p_mult
-        growth = (
-            demand_index_df.set_index("Year").loc[2025].mean() /
-            demand_index_df.set_index("Year").loc[2021].mean()
-        ) * d_mult
+        latest_price = price[latest].mean() * p_mult
+        growth = (d.loc[2025].mean() / d.loc[2021].mean()) * d_mult
         return scheme, f"${latest_price:.2f} $/MWh", f"{growth:.1f}×"
 
-    latest_price = prices_df.query("Scheme==@scheme and Year==@latest_year")["Price"].iloc[0] * p_mult
+    sl = DATA.get("prices_df:by_scheme")[scheme]
+    latest_price = price[sl][latest[sl]][0] * p_mult
     unit = SCHEME_UNIT[scheme]
     prefix = UNIT_PREFIX[unit]
-    d = demand_index_df.set_index("Year")
     growth = float(d.loc[2025,region] / d.loc[2021,region]) * d_mult
     return scheme, f"{prefix}{latest_price:.2f} {unit}", f"{growth:.1f}×"
 
-@app.callback(
-    Output("tab_content","children"),
-    Input("tabs","value"),
-    Input("region","value"),
-    Input("country","value"),
-    Input("scenario","value"),
-)
-def render_tab(tab, region, country, scenario):
+def render_tab(tab, region, scenario):
     scheme = REGION_SCHEME[region]
-    if not country:
-        country = REGION_COUNTRIES[region][0]
-
-    revenue_df = build_revenue_df(scenario)
 
     # INTRO
     if tab == "tab_intro":
@@ -482,47 +826,9 @@ def render_tab(tab, region, country, scenario):
             ])
         ])
 
-    # MAP
-    if tab == "tab_map":
-        all_countries = px.data.gapminder()["country"].unique().tolist()
-        map_df = pd.DataFrame({"Country": all_countries})
-
-        def assign_region(c):
-            if c in COUNTRY_REGION:
-                return COUNTRY_REGION[c]
-            if c in MENA: return "Middle East / MENA"
-            if c in UK:   return "United Kingdom"
-            if c in EU:   return "European Union"
-            if c in US:   return "United States"
-            return "Global"
-
-        map_df["Region"] = map_df["Country"].apply(assign_region)
-        map_df["Scheme"] = map_df["Region"].map(REGION_SCHEME)
-
-        color_map = {
-            "Middle East / MENA": "#3B82F6",
-            "United Kingdom": "#10B981",
-            "European Union": "#8B5CF6",
-            "United States": "#EF4444",
-            "Global": "#FBBF24"
-        }
-
-        fig = px.choropleth(
-            map_df,
-            locations="Country",
-            locationmode="country names",
-            color="Region",
-            hover_data={"Scheme": True, "Region": True, "Country": False},
-            title="Global EAC map — hover to see scheme, click to filter",
-            color_discrete_map=color_map
-        )
-        fig.update_layout(height=540, margin=dict(l=0,r=0,t=60,b=0))
-        return card([dcc.Graph(id="country_map", figure=fig, config={"displayModeBar": False})])
-
     # PRICES
     if tab == "tab_prices":
-        subset = prices_df.query("Scheme==@scheme") if region != "Global" else prices_df
-        anchors = anchors_df.query("Scheme==@scheme")
+        subset = DATA.get(scheme_rows_node("prices_df", scheme)) if region != "Global" else DATA.get("prices_df")
 
         unit = SCHEME_UNIT.get(scheme, "$/MWh")
         prefix = UNIT_PREFIX.get(unit, "$")
@@ -533,6 +839,7 @@ def render_tab(tab, region, country, scenario):
             markers=True, title=f"Price signals ({unit})"
         )
         if region != "Global":
+            anchors = DATA.get(scheme_rows_node("anchors_df", scheme))
             fig.add_scatter(
                 x=anchors["Year"], y=anchors["Price"],
                 mode="markers", marker=dict(size=12, symbol="diamond"),
@@ -541,20 +848,55 @@ def render_tab(tab, region, country, scenario):
         fig.update_layout(height=440, yaxis_title=unit)
         fig.update_yaxes(tickprefix=prefix)
 
-        return card([
-            dcc.Graph(figure=fig),
-            html.Div(
-                "Public anchors are price points visible in public press or market notes. "
-                "The line interpolates between anchors where live vendor data is not freely available.",
-                style={"fontSize":"12px","color":"#64748b"}
+        # forward curves: only the schemes on screen are built
+        fwd_schemes = [scheme] if region != "Global" else list(DATA.get("BASE_DEMAND_2025_TWH"))
+        fwd = pd.concat([
+            pd.DataFrame({"Scheme": s, "Month": FWD_MONTH_DATES, "Price": front_vintage_curve(s, scenario)})
+            for s in fwd_schemes
+        ], ignore_index=True)
+        fig_fwd = px.line(
+            fwd, x="Month", y="Price",
+            color="Scheme" if region=="Global" else None,
+            title=f"Forward curve by delivery month, delivery-year vintage ({unit}) — {scenario}"
+        )
+        fig_fwd.update_layout(height=380, yaxis_title=unit, xaxis_title="Delivery month")
+        fig_fwd.update_yaxes(tickprefix=prefix)
+        fwd_children = [dcc.Graph(figure=fig_fwd)]
+
+        if region != "Global":
+            grid = forward_curve(scheme, scenario)
+            live = ~np.isnan(grid).all(axis=1)
+            fig_vin = px.imshow(
+                grid[live], x=FWD_MONTH_DATES, y=[str(v) for v in FWD_VINTAGES[live]],
+                aspect="auto", origin="lower", color_continuous_scale="Blues",
+                labels=dict(x="Delivery month", y="Vintage", color=unit),
+                title=f"{scheme} forward prices by vintage × delivery month — {scenario}"
             )
+            fig_vin.update_layout(height=380)
+            fwd_children.append(dcc.Graph(figure=fig_vin))
+
+        return html.Div([
+            card([
+                dcc.Graph(figure=fig),
+                html.Div(
+                    "Public anchors are price points visible in public press or market notes. "
+                    "The line interpolates between anchors where live vendor data is not freely available.",
+                    style={"fontSize":"12px","color":"#64748b"}
+                )
+            ]),
+            html.Div(style={"height":"10px"}),
+            card(fwd_children + [html.Div(
+                "Older vintages trade at a discount and drop out once no longer deliverable. "
+                "Annual revenue uses the delivery-year vintage averaged over its months.",
+                style={"fontSize":"12px","color":"#64748b"}
+            )])
         ])
 
     # DEMAND & SUPPLY
     if tab == "tab_ds":
         if region == "Global":
             long=[]
-            for r in BASE_DEMAND_TWH_2021.keys():
+            for r in DATA.get("BASE_DEMAND_TWH_2021").keys():
                 dser = region_twh_series(r, scenario, "Demand")
                 sser = region_twh_series(r, scenario, "Supply")
                 merged = dser.merge(sser, on="Year")
@@ -576,7 +918,7 @@ def render_tab(tab, region, country, scenario):
                 card([dcc.Graph(figure=fig_s)])
             ])
 
-        if region not in BASE_DEMAND_TWH_2021:
+        if region not in DATA.get("BASE_DEMAND_TWH_2021"):
             return card([
                 html.H4("Demand & supply data not available for this region."),
                 html.Div(f"Selected region: {region}")
@@ -608,7 +950,7 @@ def render_tab(tab, region, country, scenario):
 
     # BUYERS
     if tab == "tab_buyers":
-        regional = buyers_df.query("Region==@region") if region!="Global" else buyers_df.query("Region=='Global'")
+        regional = slice_rows(DATA.get("buyers_df"), DATA.get("buyers_df:by_region"), region)
         fig = px.bar(regional, x="Buyer", y="AnnualMWh", color="Segment",
                      title=f"Top buyers / targets — {region}")
         fig.update_layout(height=420)
@@ -616,7 +958,8 @@ def render_tab(tab, region, country, scenario):
 
     # GENERATORS
     if tab == "tab_gens":
-        g = gens_df.query("Region==@region") if region!="Global" else gens_df
+        gens = DATA.get("gens_df")
+        g = slice_rows(gens, DATA.get("gens_df:by_region"), region) if region!="Global" else gens
 
         fig1 = px.scatter(
             g, x="Country", y="Tech", color="Scheme",
@@ -641,7 +984,8 @@ def render_tab(tab, region, country, scenario):
 
     # POLICY
     if tab == "tab_policy":
-        p = policy_df.query("Region==@region") if region!="Global" else policy_df
+        policy = DATA.get("policy_df")
+        p = slice_rows(policy, DATA.get("policy_df:by_region"), region) if region!="Global" else policy
         return card([
             html.H3("Policy tailwinds & trading opportunities", style={"color":PRIMARY}),
             html.Ul([html.Li(x) for x in p["PolicySummary"]]),
@@ -659,10 +1003,11 @@ def render_tab(tab, region, country, scenario):
     # REVENUE (scenario-dependent) -- USD bn
     # -----------------------------------------
     if tab == "tab_rev":
+        revenue_df = build_revenue_df(scenario, None if region == "Global" else REGION_SCHEME[region])
 
         if region != "Global":
             scheme_filter = REGION_SCHEME[region]
-            chart_df = revenue_df.query("Scheme==@scheme_filter").copy()
+            chart_df = revenue_df.copy()
             chart_title = f"{scheme_filter} revenue pool (2025–2030) — {scenario}"
             chart_color = None
         else:
@@ -682,7 +1027,7 @@ def render_tab(tab, region, country, scenario):
 
         if region != "Global":
             scheme_filter = REGION_SCHEME[region]
-            tdf = revenue_df.query("Scheme==@scheme_filter").copy()
+            tdf = revenue_df.copy()
 
             total_demand = tdf["DemandTWh"].sum()
             total_revenue_musd = tdf["RevenueMUSD"].sum()
@@ -772,20 +1117,60 @@ def render_tab(tab, region, country, scenario):
 
     return html.Div()
 
-# MAP CLICK → auto-switch region + country
+# ---------------------------
+# TAB PANELS
+# Tab switching is pure show/hide in the browser. A selection change renders
+# the visible panel first; once it is painted, the <tab>_prefetch stores of the
+# other panels trigger their background render. Static panels (map) never
+# re-render. The country dropdown does not change any panel, so it is no input.
+# ---------------------------
+def render_panel(tab, region, scenario):
+    # reused until one of the DATA nodes render_tab read changes
+    return DATA.cached(("panel", tab, region, scenario),
+                       lambda: render_tab(tab, region, scenario))
+
+app.clientside_callback(
+    """
+    function(tab) {
+        return %s.map(t => ({display: t === tab ? "block" : "none"}));
+    }
+    """ % json.dumps(TAB_IDS),
+    [Output(panel_id(tab), "style") for tab in TAB_IDS],
+    Input("tabs","value")
+)
+
 @app.callback(
-    Output("region","value", allow_duplicate=True),
-    Output("country","value", allow_duplicate=True),
-    Input("country_map","clickData"),
-    prevent_initial_call=True
+    [Output(panel_id(tab), "children") for tab in DYNAMIC_TABS] +
+    [Output(prefetch_id(tab), "data") for tab in DYNAMIC_TABS],
+    Input("region","value"),
+    Input("scenario","value"),
+    State("tabs","value")
 )
-def map_click(clickData):
-    if clickData and "points" in clickData:
-        loc = clickData["points"][0].get("location")
-        if loc in COUNTRY_REGION:
-            return COUNTRY_REGION[loc], loc
-        return "Global", loc
-    return no_update, no_update
+def render_active_panel(region, scenario, active):
+    # inactive panels are cleared so a stale selection is never shown
+    panels = [render_panel(tab, region, scenario) if tab == active else None for tab in DYNAMIC_TABS]
+    selection = {"region": region, "scenario": scenario}
+    prefetch = [no_update if tab == active else selection for tab in DYNAMIC_TABS]
+    return panels + prefetch
+
+def register_prefetch(tab):
+    @app.callback(
+        Output(panel_id(tab), "children", allow_duplicate=True),
+        Input(prefetch_id(tab), "data"),
+        prevent_initial_call=True
+    )
+    def prefetch_panel(selection):
+        if not selection:
+            return no_update
+        return render_panel(tab, selection["region"], selection["scenario"])
+
+for tab in DYNAMIC_TABS:
+    register_prefetch(tab)
+
+# DATA GRAPH timings / cache state
+@server.route("/_data-graph")
+def data_graph_stats():
+    return jsonify(DATA.stats())
 
 if __name__ == "__main__":
     if hasattr(app, "run"):
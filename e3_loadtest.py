@@ -0,0 +1,429 @@
+# e3_loadtest.py
+# E3 Energy Trading | EAC Market Dashboard — callback load generator
+# - record: drives the real callback graph (tab switches, scenario toggles,
+#   map_click cascades) and saves every /_dash-update-component body as JSONL
+# - run: replays the recorded interactions from many concurrent asyncio clients
+#   against a locally started gunicorn instance (or --url)
+# - Report: throughput, error rate, p50/p95/p99 latency per callback,
+#   at increasing concurrency levels
+# - check: asserts how many callbacks each interaction invokes
+#   (run automatically by test_e3_loadtest.py under pytest)
+# - Stdlib asyncio HTTP client (no extra dependencies)
+#
+# Usage:
+#   python e3_loadtest.py record -o callbacks.jsonl
+#   python e3_loadtest.py check
+#   python e3_loadtest.py run callbacks.jsonl --levels 1,4,16,64 --duration 10
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+UPDATE_PATH = "/_dash-update-component"
+MAP_CLICK_COUNTRIES = ["Germany", "United Kingdom", "UAE", "United States", "Brazil"]
+MAX_CASCADE_STEPS = 20
+
+# ---------------------------
+# RECORDING (callback graph simulation)
+# ---------------------------
+def _prop_id(dep):
+    return f'{dep["id"]}.{dep["property"].split("@")[0]}'
+
+class CallbackSession:
+    # Minimal stand-in for dash-renderer: keeps component props, fires the
+    # callbacks whose inputs changed, waits for upstream callbacks before
+    # firing downstream ones, and applies each response back to the props.
+    def __init__(self, app, post):
+        from dash._utils import split_callback_id
+
+        self.post = post
+        self.values = {}
+        for comp in _walk(app.layout):
+            for prop in comp._prop_names:
+                if prop != "children" and getattr(comp, prop, None) is not None:
+                    self.values[f"{comp.id}.{prop}"] = getattr(comp, prop)
+
+        prevent = {c["output"]: c.get("prevent_initial_call", False) for c in app._callback_list}
+        self.callbacks = {}
+        for key, cb in app.callback_map.items():
+            if "callback" not in cb:
+                continue  # clientside: runs in the browser, never reaches the server
+            outputs = split_callback_id(key)
+            self.callbacks[key] = {
+                "name": cb["callback"].__name__,
+                "multi": isinstance(outputs, list),
+                "outputs": outputs if isinstance(outputs, list) else [outputs],
+                "inputs": cb["inputs"],
+                "state": cb["state"],
+                "prevent_initial_call": prevent.get(key, False),
+            }
+
+        # report label: function name, plus the first output when several
+        # callbacks share a name (one prefetch_panel per tab)
+        names = [cb["name"] for cb in self.callbacks.values()]
+        for cb in self.callbacks.values():
+            cb["label"] = cb["name"] if names.count(cb["name"]) == 1 \
+                else f'{cb["name"]}[{_prop_id(cb["outputs"][0])}]'
+
+        # key -> keys of every callback it (transitively) feeds; a callback's
+        # own outputs never re-trigger it
+        edges = {
+            a: {b for b, cb in self.callbacks.items() if b != a
+                and {_prop_id(o) for o in ca["outputs"]} & {_prop_id(i) for i in cb["inputs"]}}
+            for a, ca in self.callbacks.items()
+        }
+        self.downstream = {}
+        for a in edges:
+            seen, todo = set(), list(edges[a])
+            while todo:
+                b = todo.pop()
+                if b not in seen:
+                    seen.add(b)
+                    todo.extend(edges[b])
+            self.downstream[a] = seen
+
+    def _body(self, key, changed):
+        cb = self.callbacks[key]
+        fill = lambda deps: [
+            {"id": d["id"], "property": d["property"], "value": self.values.get(_prop_id(d))}
+            for d in deps
+        ]
+        return {
+            "output": key,
+            "outputs": cb["outputs"] if cb["multi"] else cb["outputs"][0],
+            "inputs": fill(cb["inputs"]),
+            "changedPropIds": sorted(changed),
+            "state": fill(cb["state"]),
+        }
+
+    def _trigger(self, pending, changed, source=None):
+        for key, cb in self.callbacks.items():
+            if key == source:
+                continue
+            hit = changed & {_prop_id(i) for i in cb["inputs"]}
+            if hit:
+                pending.setdefault(key, set()).update(hit)
+
+    def _cascade(self, pending):
+        steps = []
+        while pending:
+            if len(steps) >= MAX_CASCADE_STEPS:
+                raise RuntimeError(f"callback cascade did not settle: {sorted(pending)}")
+            ready = [k for k in pending
+                     if not any(k in self.downstream[o] for o in pending if o != k)]
+            step = [{"callback": self.callbacks[k]["name"], "label": self.callbacks[k]["label"],
+                     "body": self._body(k, pending.pop(k))} for k in ready]
+            for req in step:
+                changed = set()
+                resp = self.post(req["body"]) or {}
+                for cid, props in resp.get("response", {}).items():
+                    for prop, val in props.items():
+                        self.values[f"{cid}.{prop}"] = val
+                        changed.add(f"{cid}.{prop}")
+                self._trigger(pending, changed, source=req["body"]["output"])
+            steps.append(step)
+        return steps
+
+    def load(self):
+        return self._cascade({k: set() for k, cb in self.callbacks.items()
+                              if not cb["prevent_initial_call"]})
+
+    def set_props(self, props):
+        self.values.update(props)
+        pending = {}
+        self._trigger(pending, set(props))
+        return self._cascade(pending)
+
+def _walk(component):
+    for comp in component._traverse():
+        if getattr(comp, "id", None) is not None:
+            yield comp
+    if getattr(component, "id", None) is not None:
+        yield component
+
+def record_interactions():
+    from e3_eac_dashboard import app as dash_app, SCENARIOS, REGION_COUNTRIES
+
+    client = dash_app.server.test_client()
+
+    def post(body):
+        r = client.post(UPDATE_PATH, json=body)
+        if r.status_code == 204:
+            return None
+        if r.status_code != 200:
+            raise RuntimeError(f'{body["output"]} -> HTTP {r.status_code}')
+        return r.get_json()
+
+    session = CallbackSession(dash_app, post)
+    tabs = next(c for c in _walk(dash_app.layout) if c.id == "tabs")
+    tab_values = [t.value for t in tabs.children]
+    scenarios = list(SCENARIOS)
+    regions = list(REGION_COUNTRIES)
+
+    out = []
+
+    def record(interaction, props=None):
+        steps = session.set_props(props) if props else session.load()
+        # the visible tab decides how many panels are prefetched
+        out.append({"interaction": interaction, "tab": session.values["tabs.value"], "steps": steps})
+
+    record("initial_load")
+    for tab in tab_values[1:] + tab_values[:1]:
+        record(f"tab:{tab}", {"tabs.value": tab})
+    for scenario in scenarios[1:] + scenarios[:1]:
+        record(f"scenario:{scenario}", {"scenario.value": scenario})
+    for region in regions[1:] + regions[:1]:
+        record(f"region:{region}", {"region.value": region})
+    for country in REGION_COUNTRIES[regions[0]][1:3]:
+        record(f"country:{country}", {"country.value": country})
+    record("tab:tab_map", {"tabs.value": "tab_map"})
+    for country in MAP_CLICK_COUNTRIES:
+        record(f"map_click:{country}", {"country_map.clickData": {"points": [{"location": country}]}})
+    return out
+
+# ---------------------------
+# INVOCATION CHECKS
+# One user action must cost exactly one render of the visible panel; hidden
+# panels are filled by prefetch_panel, tab switches and the country dropdown
+# never reach the server.
+# ---------------------------
+def expected_invocations(kind, active):
+    from e3_eac_dashboard import DYNAMIC_TABS
+
+    prefetch = len([tab for tab in DYNAMIC_TABS if tab != active])
+    return {
+        "initial_load": {"select_region": 1, "update_kpis": 1, "render_active_panel": 1, "prefetch_panel": prefetch},
+        "tab":          {"select_region": 0, "update_kpis": 0, "render_active_panel": 0, "prefetch_panel": 0},
+        "scenario":     {"select_region": 0, "update_kpis": 1, "render_active_panel": 1, "prefetch_panel": prefetch},
+        "region":       {"select_region": 1, "update_kpis": 1, "render_active_panel": 1, "prefetch_panel": prefetch},
+        "country":      {"select_region": 0, "update_kpis": 0, "render_active_panel": 0, "prefetch_panel": 0},
+        "map_click":    {"select_region": 1, "update_kpis": 1, "render_active_panel": 1, "prefetch_panel": prefetch},
+    }.get(kind, {})
+
+def count_invocations(item):
+    counts = {}
+    for step in item["steps"]:
+        for req in step:
+            counts[req["callback"]] = counts.get(req["callback"], 0) + 1
+    return counts
+
+def check_invocations(corpus):
+    problems = []
+    for item in corpus:
+        counts = count_invocations(item)
+        for name, n in expected_invocations(item["interaction"].split(":")[0], item["tab"]).items():
+            if counts.get(name, 0) != n:
+                problems.append(f'{item["interaction"]}: {name} ran {counts.get(name, 0)}x, expected {n}x')
+    return problems
+
+def save_corpus(corpus, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for item in corpus:
+            f.write(json.dumps(item) + "\n")
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# ---------------------------
+# HTTP CLIENT (asyncio streams)
+# ---------------------------
+async def post_json(host, port, path, payload, timeout):
+    data = json.dumps(payload).encode()
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(head + data)
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    status_line = raw.split(b"\r\n", 1)[0].split()
+    return int(status_line[1]) if len(status_line) > 1 else 0
+
+# ---------------------------
+# REPLAY
+# ---------------------------
+async def _client(host, port, corpus, offset, deadline, samples, timeout):
+    i = offset
+    while time.perf_counter() < deadline:
+        interaction = corpus[i % len(corpus)]
+        i += 1
+        for step in interaction["steps"]:
+            await asyncio.gather(*(
+                _timed(host, port, req, samples, timeout) for req in step
+            ))
+
+async def _timed(host, port, req, samples, timeout):
+    t0 = time.perf_counter()
+    try:
+        status = await post_json(host, port, UPDATE_PATH, req["body"], timeout)
+        ok = status in (200, 204)
+    except (OSError, asyncio.TimeoutError):
+        ok = False
+    samples.append((req.get("label", req["callback"]), time.perf_counter() - t0, ok))
+
+async def run_level(host, port, corpus, concurrency, duration, timeout=30.0):
+    # interactions handled purely client-side produce no server traffic
+    corpus = [item for item in corpus if item["steps"]]
+    samples = []
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    await asyncio.gather(*(
+        _client(host, port, corpus, n, deadline, samples, timeout) for n in range(concurrency)
+    ))
+    return summarize(concurrency, samples, time.perf_counter() - t0)
+
+def summarize(concurrency, samples, elapsed):
+    per_cb = {}
+    for name, dt, ok in samples:
+        per_cb.setdefault(name, []).append((dt, ok))
+
+    callbacks = {}
+    for name, rows in sorted(per_cb.items()):
+        lat = np.array([dt for dt, _ in rows]) * 1000.0
+        errors = sum(1 for _, ok in rows if not ok)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        callbacks[name] = {
+            "requests": len(rows), "errors": errors, "error_rate": errors / len(rows),
+            "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+        }
+
+    total = len(samples)
+    errors = sum(1 for _, _, ok in samples if not ok)
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "callbacks": callbacks,
+    }
+
+def format_report(results):
+    lines = []
+    for r in results:
+        lines.append(
+            f"concurrency {r['concurrency']:>4}: {r['requests']:,} req in {r['elapsed_s']:.1f}s"
+            f" -> {r['throughput_rps']:,.1f} req/s, errors {r['error_rate']:.2%}"
+        )
+        w = max([20] + [len(name) + 2 for name in r["callbacks"]])
+        lines.append(f"  {'callback':<{w}}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err %':>8}")
+        for name, c in r["callbacks"].items():
+            lines.append(
+                f"  {name:<{w}}{c['requests']:>8,}{c['p50_ms']:>10.1f}{c['p95_ms']:>10.1f}"
+                f"{c['p99_ms']:>10.1f}{c['error_rate']*100:>8.2f}"
+            )
+    return "\n".join(lines)
+
+# ---------------------------
+# LOCAL SERVER
+# ---------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_local_server(workers, threads, startup_timeout=60.0):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}",
+         "--workers", str(workers), "--threads", str(threads), "--log-level", "warning", "--preload",
+         "e3_eac_dashboard:server"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return proc, "127.0.0.1", port
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start in time")
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dash callback load generator for the EAC dashboard")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    rec = sub.add_parser("record", help="record callback request bodies for built-in interactions")
+    rec.add_argument("-o", "--output", default="callbacks.jsonl")
+
+    sub.add_parser("check", help="assert callback invocations per built-in interaction")
+
+    run = sub.add_parser("run", help="replay recorded interactions at increasing concurrency")
+    run.add_argument("corpus", nargs="?", help="JSONL from `record` (recorded on the fly if omitted)")
+    run.add_argument("--levels", default="1,4,16,64")
+    run.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    run.add_argument("--url", help="target an already running instance instead of starting one")
+    run.add_argument("--workers", type=int, default=4)
+    run.add_argument("--threads", type=int, default=1)
+    run.add_argument("--timeout", type=float, default=30.0)
+    run.add_argument("--json", help="also write results to this file")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "check":
+        corpus = record_interactions()
+        for item in corpus:
+            counts = count_invocations(item)
+            print(f'{item["interaction"]:<32}' + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+        problems = check_invocations(corpus)
+        for p in problems:
+            print(f"FAIL {p}")
+        return 1 if problems else 0
+
+    if args.cmd == "record":
+        corpus = record_interactions()
+        save_corpus(corpus, args.output)
+        n = sum(len(step) for item in corpus for step in item["steps"])
+        print(f"recorded {len(corpus)} interactions / {n} requests -> {args.output}")
+        return 0
+
+    corpus = load_corpus(args.corpus) if args.corpus else record_interactions()
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+
+    proc = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port = u.hostname, u.port or 80
+    else:
+        proc, host, port = start_local_server(args.workers, args.threads)
+
+    try:
+        results = []
+        for level in levels:
+            results.append(asyncio.run(
+                run_level(host, port, corpus, level, args.duration, args.timeout)
+            ))
+            print(format_report(results[-1:]), flush=True)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# test_e3_eac_dashboard.py
+# DATA graph: incremental recompute, panel cache dependencies, scheme edits;
+# forward-curve grid invariants
+# Run: python -m pytest -q
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import e3_eac_dashboard as dash_mod
+from e3_eac_dashboard import (
+    DATA, DataGraph, app, build_revenue_df, compact_df, forward_curve, front_vintage, price_forecast_base,
+    group_slices, slice_rows, render_panel, render_tab, BASE_DEMAND_2025_TWH, DYNAMIC_TABS, FWD_MONTHS, FWD_MONTH_YEAR, FWD_VINTAGES,
+    REGION_SCHEME, SCENARIOS, VINTAGE_DISCOUNT, VINTAGE_LIFE_YEARS, forecast_years,
+)
+
+SCHEMES = list(BASE_DEMAND_2025_TWH)
+
+@pytest.fixture
+def restore_sources():
+    saved = {n: node["value"] for n, node in DATA.nodes.items() if node["fn"] is None}
+    registered = set(DATA.nodes)
+    yield
+    for n, value in saved.items():
+        DATA.set(n, value)
+    for n in set(DATA.nodes) - registered:
+        del DATA.nodes[n]
+    DATA.cache.clear()  # entries may read the nodes just removed
+
+def render_all_panels():
+    for tab in DYNAMIC_TABS:
+        for region in REGION_SCHEME:
+            for scenario in SCENARIOS:
+                render_panel(tab, region, scenario)
+    runs = {n: node["runs"] for n, node in DATA.stats()["nodes"].items()}
+    panels = {key: value for key, (_, value) in DATA.cache.items() if key[0] == "panel"}
+    return runs, panels
+
+def edit_and_rerender(name, value):
+    runs, panels = render_all_panels()
+    DATA.set(name, value)
+    runs2, panels2 = render_all_panels()
+    reran = {n for n in runs2 if runs2[n] != runs.get(n, 0)}
+    rebuilt = {key for key in panels if panels2[key] is not panels[key]}
+    return reran, rebuilt
+
+def test_price_edit_reruns_only_that_scheme(restore_sources):
+    prices = DATA.get("prices_df").copy()
+    prices.loc[(prices["Scheme"] == "REGOs") & (prices["Year"] == 2025), "Price"] *= 1.1
+    reran, rebuilt = edit_and_rerender("prices_df", prices)
+
+    assert {"price_fwd:REGOs"} | {f"forward_curve:REGOs:{s}" for s in SCENARIOS} <= reran
+    for other in SCHEMES:
+        if other != "REGOs":
+            # the other slices re-slice the edited frame, fingerprint the same and stop there
+            assert {n for n in reran if other in n.split(":")} <= {f"prices_df:{other}"}
+    assert rebuilt == {("panel", tab, region, scenario) for tab in ["tab_prices", "tab_rev"]
+                       for region in ["United Kingdom", "Global"] for scenario in SCENARIOS}
+
+def test_country_shares_edit_invalidates_only_demand_supply(restore_sources):
+    shares = {r: dict(c) for r, c in DATA.get("COUNTRY_SHARES").items()}
+    region = next(iter(shares))
+    shares[region] = {c: v * 2 for c, v in shares[region].items()}
+    reran, rebuilt = edit_and_rerender("COUNTRY_SHARES", shares)
+
+    assert reran <= {n for n, node in DATA.nodes.items() if "COUNTRY_SHARES" in node["deps"]}
+    assert rebuilt and {key[1] for key in rebuilt} == {"tab_ds"}
+
+def test_unknown_scenario_registers_no_node():
+    for call in [lambda: forward_curve("REGOs", "Bogus"), lambda: build_revenue_df("Bogus"),
+                 lambda: render_tab("tab_prices", "United Kingdom", "Bogus"),
+                 lambda: render_tab("tab_rev", "Global", "Bogus")]:
+        with pytest.raises(KeyError):
+            call()
+    assert not [n for n in DATA.nodes if "Bogus" in n]
+
+def test_data_graph_endpoint():
+    r = app.server.test_client().get("/_data-graph")
+    assert r.status_code == 200
+    stats = r.get_json()
+    assert stats["nodes"]["prices_df:by_scheme"]["deps"] == ["prices_df"]
+    assert set(stats["cache"]) == {"entries", "hits", "misses"}
+
+def test_sources_hold_the_compact_frames():
+    for name, key in [("prices_df","Scheme"), ("anchors_df","Scheme"),
+                      ("buyers_df","Region"), ("gens_df","Region"), ("policy_df","Region")]:
+        assert DATA.get(name) is getattr(dash_mod, name)
+        assert isinstance(DATA.get(name)[key].dtype, pd.CategoricalDtype)
+
+def test_region_countries_is_not_a_source():
+    with pytest.raises(KeyError):
+        DATA.set("REGION_COUNTRIES", {})
+
+def test_revenue_follows_added_scheme(restore_sources):
+    foo = pd.DataFrame({"Scheme": "Foo", "Year": range(2020, 2026), "Price": [1.0, 1.1, 1.2, 1.3, 1.4, 1.5]})
+    prices = pd.concat([DATA.get("prices_df").astype({"Scheme": str}), foo], ignore_index=True)
+    DATA.set("prices_df", compact_df(prices, "Scheme"))
+    for name, value in [("BASE_DEMAND_2025_TWH", 10), ("FORECAST_CAGR", 0.05),
+                        ("VINTAGE_LIFE_YEARS", 1), ("VINTAGE_DISCOUNT", 0.2)]:
+        DATA.set(name, {**DATA.get(name), "Foo": value})
+
+    revenue = build_revenue_df("Base")
+    assert list(pd.unique(revenue["Scheme"]))[-1] == "Foo"
+    assert build_revenue_df("Base", "Foo")["DemandTWh"].iloc[0] == pytest.approx(10)
+
+def test_cached_keeps_fingerprint_read_during_build():
+    graph = DataGraph()
+    graph.source("x", 1)
+
+    def build():
+        value = graph.get("x")
+        graph.set("x", 2)  # another thread edits x before the entry is stored
+        return value
+
+    assert graph.cached("k", build) == 1
+    # the entry was built from x=1, so it must not be served for x=2
+    assert graph.cached("k", lambda: graph.get("x")) == 2
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_forward_grid_invariants(scheme, scenario):
+    grid = forward_curve(scheme, scenario)
+    assert grid.shape == (len(FWD_VINTAGES), len(FWD_MONTHS)) == (len(FWD_VINTAGES), 72)
+
+    # front vintage averages to the annual forward price in every delivery year
+    prices = dash_mod.prices_df
+    fwd = price_forecast_base(slice_rows(prices, group_slices(prices["Scheme"]), scheme))
+    front = front_vintage(grid)
+    for i, y in enumerate(forecast_years):
+        assert front[i*12:(i+1)*12].mean() == pytest.approx(fwd[y] * SCENARIOS[scenario]["price_mult"])
+
+    # deliverable vintages only, discounted (1-d)**age against the front vintage
+    age = FWD_MONTH_YEAR[None, :] - FWD_VINTAGES[:, None]
+    valid = (age >= 0) & (age <= VINTAGE_LIFE_YEARS[scheme])
+    assert (np.isnan(grid) == ~valid).all()
+    expected = front[None, :] * (1 - VINTAGE_DISCOUNT[scheme]) ** age
+    assert np.allclose(grid[valid], expected[valid])
+
+@pytest.mark.parametrize("region", [r for r in REGION_SCHEME if r != "Global"])
+def test_single_region_builds_only_its_scheme(monkeypatch, region):
+    # start from a graph without any per-scheme node registered
+    nodes = {n: dict(v) for n, v in DATA.nodes.items() if not any(s in n for s in SCHEMES)}
+    monkeypatch.setattr(DATA, "nodes", nodes)
+    monkeypatch.setattr(DATA, "cache", OrderedDict())
+
+    for tab in ["tab_prices", "tab_rev"]:
+        render_tab(tab, region, "Base")
+    curves = [n for n in DATA.nodes if n.startswith("forward_curve:")]
+    assert curves == [f"forward_curve:{REGION_SCHEME[region]}:Base"]
+    assert DATA.nodes[curves[0]]["runs"] == 1
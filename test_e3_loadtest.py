@@ -0,0 +1,58 @@
+# test_e3_loadtest.py
+# Callback invocation budget per interaction, and the select_region self-loop
+# Run: python -m pytest -q
+
+import pytest
+
+from e3_eac_dashboard import app, REGION_COUNTRIES
+from e3_loadtest import UPDATE_PATH, MAP_CLICK_COUNTRIES, check_invocations, record_interactions
+
+SELECT_REGION = "..region.value...country.options...country.value.."
+
+@pytest.fixture(scope="module")
+def client():
+    return app.server.test_client()
+
+@pytest.fixture(scope="module")
+def corpus():
+    return record_interactions()
+
+def post_select_region(client, region, click, changed):
+    body = {
+        "output": SELECT_REGION,
+        "outputs": [{"id": "region", "property": "value"},
+                    {"id": "country", "property": "options"},
+                    {"id": "country", "property": "value"}],
+        "inputs": [{"id": "region", "property": "value", "value": region},
+                   {"id": "country_map", "property": "clickData", "value": click}],
+        "changedPropIds": [changed],
+        "state": [],
+    }
+    r = client.post(UPDATE_PATH, json=body)
+    assert r.status_code == 200
+    out = r.get_json()["response"]
+    return out["region"]["value"], out["country"]["value"]
+
+def test_recorded_interactions_match_invocation_budget(corpus):
+    assert {item["interaction"].split(":")[0] for item in corpus} >= {
+        "initial_load", "tab", "scenario", "region", "country", "map_click"}
+    assert check_invocations(corpus) == []
+
+def test_country_dropdown_makes_no_requests(corpus):
+    assert all(not item["steps"] for item in corpus if item["interaction"].startswith("country:"))
+
+@pytest.mark.parametrize("country", MAP_CLICK_COUNTRIES)
+def test_select_region_output_is_a_fixed_point(client, country):
+    # select_region writes region.value, one of its own inputs. Dash does not
+    # re-fire a callback from its own output; should it ever, feeding the
+    # written region back must return the same region, so no loop can form.
+    click = {"points": [{"location": country}]}
+    region, picked = post_select_region(client, "Global", click, "country_map.clickData")
+    assert picked in REGION_COUNTRIES[region]
+
+    again, _ = post_select_region(client, region, click, "region.value")
+    assert again == region
+
+@pytest.mark.parametrize("region", list(REGION_COUNTRIES))
+def test_select_region_keeps_dropdown_region(client, region):
+    assert post_select_region(client, region, None, "region.value") == (region, REGION_COUNTRIES[region][0])